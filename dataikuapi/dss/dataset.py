@@ -1,12 +1,14 @@
 import datetime
 
-from ..utils import DataikuException
+from ..utils import DataikuException, dku_quote_fn
 from ..utils import DataikuUTF8CSVReader
-from ..utils import DataikuStreamedHttpUTF8CSVReader
+from ..utils import DataikuStreamedHttpUTF8CSVReader, DEFAULT_ROW_STREAM_BUFFER
+from ..utils import _stream_accept_encoding, _decoded_raw_stream
+from ..utils import MULTIPART_STREAMING_THRESHOLD, DEFAULT_UPLOAD_CHUNK_SIZE, _remaining_file_size, _streamed_multipart
 from .future import DSSFuture
-import json, warnings
+import json, warnings, functools, time
+from contextlib import closing
 from .utils import DSSTaggableObjectListItem, DSSTaggableObjectSettings
-from .future import DSSFuture
 from .metrics import ComputedMetrics
 from .discussion import DSSObjectDiscussions
 from .statistics import DSSStatisticsWorksheet
@@ -16,11 +18,36 @@ try:
 except NameError:
     basestring = str
 
+_ARROW_STREAM_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+# Time to live, in seconds, of the results of read-only calls cached on a DSSDataset handle
+_READ_CACHE_TTL = 30
+
+def _cached(ttl=_READ_CACHE_TTL):
+    """
+    Caches the result of a read-only DSSDataset method on the handle for ttl seconds.
+
+    The method returns the body of a JSON response, as bytes: the body is what gets cached, and it is
+    parsed on each call, so that every caller gets its own objects to modify freely without deep copies.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            entry = self._cache.get(key)
+            if entry is None or time.time() >= entry[0]:
+                entry = (time.time() + ttl, func(self, *args, **kwargs))
+                self._cache[key] = entry
+            return json.loads(entry[1].decode("utf-8"))
+        return wrapper
+    return decorator
+
 class DSSDatasetListItem(DSSTaggableObjectListItem):
     """An item in a list of datasets. Do not instantiate this class, use :meth:`dataikuapi.dss.project.DSSProject.list_datasets`"""
     def __init__(self, client, data):
         super(DSSDatasetListItem, self).__init__(data)
         self.client = client
+        self._columns_index = None
 
     def to_dataset(self):
         """Gets the :class:`DSSDataset` corresponding to this dataset"""
@@ -52,8 +79,14 @@ class DSSDatasetListItem(DSSTaggableObjectListItem):
         :param str column: Column to find
         :return a dict of the column settings or None if column does not exist
         """
-        matched = [col for col in self.schema["columns"] if col["name"] == column]
-        return None if len(matched) == 0 else matched[0]
+        columns = self.schema["columns"]
+        # the index is built on first use, and rebuilt if the columns list was replaced
+        if self._columns_index is None or self._columns_index[0] is not columns:
+            index = {}
+            for col in columns:
+                index.setdefault(col["name"], col)
+            self._columns_index = (columns, index)
+        return self._columns_index[1].get(column)
 
 class DSSDataset(object):
     """
@@ -61,9 +94,12 @@ class DSSDataset(object):
     """
     def __init__(self, client, project_key, dataset_name):
         self.client = client
-        self.project = client.get_project(project_key)
+        self._project = None
         self.project_key = project_key
         self.dataset_name = dataset_name
+        # quoted once here rather than on every call
+        self._url_prefix = "/projects/%s/datasets/%s" % (dku_quote_fn(project_key, safe=''), dku_quote_fn(dataset_name, safe=''))
+        self._cache = {}
 
     @property
     def id(self):
@@ -72,6 +108,17 @@ class DSSDataset(object):
     @property
     def name(self):
         return self.dataset_name
+
+    @property
+    def project(self):
+        """
+        The project of this dataset, created on first access
+
+        :rtype: :class:`dataikuapi.dss.project.DSSProject`
+        """
+        if self._project is None:
+            self._project = self.client.get_project(self.project_key)
+        return self._project
     
     ########################################################
     # Dataset deletion
@@ -83,8 +130,9 @@ class DSSDataset(object):
 
         :param bool drop_data: Should the data of the dataset be dropped
         """
+        self.invalidate_cache()
         return self.client._perform_empty(
-            "DELETE", "/projects/%s/datasets/%s" % (self.project_key, self.dataset_name), params = {
+            "DELETE", self._url_prefix, params = {
                 "dropData" : drop_data
             })
 
@@ -103,6 +151,8 @@ class DSSDataset(object):
         You must use :meth:`~DSSDatasetSettings.save()` on the returned object to make your changes effective
         on the dataset.
 
+        The settings are cached on this handle for a few seconds, until a change is made through it.
+
         .. code-block:: python
 
             # Example: activating discrete partitioning on a SQL dataset
@@ -113,7 +163,7 @@ class DSSDataset(object):
 
         :rtype: :class:`DSSDatasetSettings`
         """
-        data = self.client._perform_json("GET", "/projects/%s/datasets/%s" % (self.project_key, self.dataset_name))
+        data = self._get_raw_settings()
 
         if data["type"] in self.__class__._FS_TYPES:
             return FSLikeDatasetSettings(self, data)
@@ -122,6 +172,10 @@ class DSSDataset(object):
         else:
             return DSSDatasetSettings(self, data)
 
+    @_cached()
+    def _get_raw_settings(self):
+        return self.client._perform_http("GET", self._url_prefix).content
+
 
     def get_definition(self):
         """
@@ -131,7 +185,7 @@ class DSSDataset(object):
         """
         warnings.warn("Dataset.get_definition is deprecated, please use get_settings", DeprecationWarning)
         return self.client._perform_json(
-                "GET", "/projects/%s/datasets/%s" % (self.project_key, self.dataset_name))
+                "GET", self._url_prefix)
 
     def set_definition(self, definition):
         """
@@ -142,14 +196,16 @@ class DSSDataset(object):
                             that has been retrieved using the get_definition call.
         """
         warnings.warn("Dataset.set_definition is deprecated, please use get_settings", DeprecationWarning)
+        self.invalidate_cache()
         return self.client._perform_json(
-                "PUT", "/projects/%s/datasets/%s" % (self.project_key, self.dataset_name),
+                "PUT", self._url_prefix,
                 body=definition)
 
     def exists(self):
         """Returns whether this dataset exists"""
         try:
-            self.get_metadata()
+            # not through get_metadata, whose cache would still answer after the dataset is deleted
+            self.client._perform_http("GET", self._url_prefix + "/metadata")
             return True
         except Exception as e:
             return False
@@ -158,15 +214,49 @@ class DSSDataset(object):
     # Dataset metadata
     ########################################################
 
-    def get_schema(self):
+    def get_schema(self, refresh=False):
         """
         Get the schema of the dataset
-        
+
+        The schema is cached on this handle for a few seconds. Changes made through :meth:`set_schema`
+        or :meth:`DSSDatasetSettings.save` invalidate it; use ``refresh=True`` to force a refetch
+        when the schema may have been modified by someone else.
+
+        Args:
+            refresh: if True, ignore the cached schema and fetch it again from the backend
+
         Returns:
-            a JSON object of the schema, with the list of columns
+            a JSON object of the schema, with the list of columns. It is a copy, modify it and pass it
+            to :meth:`set_schema` to change the schema
         """
-        return self.client._perform_json(
-                "GET", "/projects/%s/datasets/%s/schema" % (self.project_key, self.dataset_name))
+        if refresh:
+            self.invalidate_schema_cache()
+        return self._get_schema()
+
+    @_cached()
+    def _get_schema(self):
+        return self.client._perform_http(
+                "GET", self._url_prefix + "/schema").content
+
+    def invalidate_schema_cache(self):
+        """
+        Drop the schema cached by :meth:`get_schema`, so that the next call fetches it from the backend
+        """
+        self._cache.pop(("_get_schema", (), ()), None)
+
+    def _peek_cache(self, name):
+        """Returns the unexpired value cached for the @_cached method name called without arguments, or None"""
+        entry = self._cache.get((name, (), ()))
+        if entry is None or time.time() >= entry[0]:
+            return None
+        return json.loads(entry[1].decode("utf-8"))
+
+    def invalidate_cache(self):
+        """
+        Drop everything cached on this handle, including the schema, so that the next calls fetch
+        fresh data from the backend
+        """
+        self._cache.clear()
 
     def set_schema(self, schema):
         """
@@ -176,21 +266,24 @@ class DSSDataset(object):
             schema: the desired schema for the dataset, as a JSON object. All columns have to provide their
             name and type
         """
+        self.invalidate_cache()
         return self.client._perform_json(
-                "PUT", "/projects/%s/datasets/%s/schema" % (self.project_key, self.dataset_name),
+                "PUT", self._url_prefix + "/schema",
                 body=schema)
 
+    @_cached()
     def get_metadata(self):
         """
         Get the metadata attached to this dataset. The metadata contains label, description
-        checklists, tags and custom metadata of the dataset
+        checklists, tags and custom metadata of the dataset. It is cached on this handle for a few
+        seconds, until a change is made through it.
         
         Returns:
             a dict object. For more information on available metadata, please see
             https://doc.dataiku.com/dss/api/5.0/rest/
         """
-        return self.client._perform_json(
-                "GET", "/projects/%s/datasets/%s/metadata" % (self.project_key, self.dataset_name))
+        return self.client._perform_http(
+                "GET", self._url_prefix + "/metadata").content
 
     def set_metadata(self, metadata):
         """
@@ -200,8 +293,9 @@ class DSSDataset(object):
             metadata: the new state of the metadata for the dataset. You should only set a metadata object 
             that has been retrieved using the get_metadata call.
         """
+        self.invalidate_cache()
         return self.client._perform_json(
-                "PUT", "/projects/%s/datasets/%s/metadata" % (self.project_key, self.dataset_name),
+                "PUT", self._url_prefix + "/metadata",
                 body=metadata)
 
 
@@ -209,33 +303,189 @@ class DSSDataset(object):
     # Dataset data
     ########################################################
 
-    def iter_rows(self, partitions=None):
+    def iter_rows(self, partitions=None, buffer_size=DEFAULT_ROW_STREAM_BUFFER, compression="auto"):
         """
         Get the dataset's data
-        
+
+        With ``compression="auto"``, the data is downloaded gzip (or zstd, if the zstandard package is installed)
+        compressed when the backend supports it. This costs some CPU to decompress, but typically moves 3 to 10 times
+        fewer bytes over the network for tabular data. Use ``compression="none"`` if the network is not the
+        bottleneck, for instance when the data is already stored compressed.
+
+        Args:
+            partitions: (optional) the partitions to read
+            buffer_size: (optional) size in bytes of the buffer used to read the data stream
+            compression: (optional) "auto" or "none"
+
         Return:
             an iterator over the rows, each row being a tuple of values. The order of values
             in the tuples is the same as the order of columns in the schema returned by get_schema
         """
-        csv_stream = self.client._perform_raw(
-                "GET" , "/projects/%s/datasets/%s/data/" %(self.project_key, self.dataset_name),
+        csv_stream = self._stream_data(partitions, compression)
+
+        return DataikuStreamedHttpUTF8CSVReader(self.get_schema()["columns"], csv_stream,
+                                                buffer_size=buffer_size).iter_rows()
+
+    def iter_rows_batched(self, batch_size=10000, partitions=None, as_tuple=False, compression="auto"):
+        """
+        Get the dataset's data by batches of rows, each batch being laid out by column
+
+        The values are appended to their column as the data is parsed, without building a list per row
+        like :meth:`iter_rows` does.
+
+        Args:
+            batch_size: (optional) the maximum number of rows in each batch
+            partitions: (optional) the partitions to read
+            as_tuple: (optional) if True, each batch is a tuple of column value lists in the order
+            of the schema, instead of a dict keyed by column name
+            compression: (optional) "auto" or "none", see :meth:`iter_rows`
+
+        Return:
+            an iterator over the batches. Each batch maps the column names of the schema returned by
+            get_schema to the list of values of that column, cast as in :meth:`iter_rows`
+        """
+        columns = self.get_schema()["columns"]
+        names = [col["name"] for col in columns]
+        csv_stream = self._stream_data(partitions, compression)
+        reader = DataikuStreamedHttpUTF8CSVReader(columns, csv_stream)
+        # rows are padded to the schema width, extra trailing values are dropped
+        for values in reader.iter_column_batches(batch_size):
+            if as_tuple:
+                yield tuple(values)
+            else:
+                yield dict(zip(names, values))
+
+    def get_dataframe(self, partitions=None, engine="pyarrow", compression="auto"):
+        """
+        Get the dataset's data as a pandas dataframe. Requires pandas.
+
+        With the "pyarrow" engine, the data is parsed by pyarrow, which is much faster than the
+        row-by-row parsing of :meth:`iter_rows` on large or numeric-heavy datasets. If pyarrow is not
+        installed, the "python" engine is used instead.
+
+        Args:
+            partitions: (optional) the partitions to read
+            engine: (optional) the parser to use, "pyarrow" or "python"
+            compression: (optional) "auto" or "none", see :meth:`iter_rows`
+
+        Return:
+            a :class:`pandas.DataFrame` with the columns of the schema returned by get_schema
+        """
+        if engine == "pyarrow":
+            try:
+                import pyarrow
+            except ImportError:
+                engine = "python"
+            else:
+                return self._read_arrow_table(partitions, compression).to_pandas()
+        if engine != "python":
+            raise ValueError("Unknown engine: %s" % engine)
+
+        import pandas as pd
+        columns = [col["name"] for col in self.get_schema()["columns"]]
+        return pd.DataFrame.from_records(self.iter_rows(partitions=partitions, compression=compression), columns=columns)
+
+    def iter_batches_arrow(self, partitions=None, compression="auto"):
+        """
+        Get the dataset's data as Arrow record batches. Requires pyarrow.
+
+        The data is requested in the Arrow IPC stream format, so that no text needs to be parsed. If the
+        backend can't serve this format (it answers 406, or sends something else than an Arrow stream), the TSV
+        data is parsed by pyarrow instead, as in :meth:`get_dataframe`
+
+        Args:
+            partitions: (optional) the partitions to read
+            compression: (optional) "auto" or "none", see :meth:`iter_rows`
+
+        Return:
+            an iterator over :class:`pyarrow.RecordBatch`, with the columns of the schema returned by get_schema
+        """
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+
+        try:
+            arrow_stream = self._stream_data(partitions, compression, format="arrow-stream")
+        except DataikuException as e:
+            # only an unsupported format falls back to TSV, other errors would just happen again
+            if getattr(e, "status_code", None) != 406:
+                raise
+            arrow_stream = None
+        if arrow_stream is not None and not arrow_stream.headers.get("Content-Type", "").startswith(_ARROW_STREAM_CONTENT_TYPE):
+            # the format was ignored and something else came back
+            arrow_stream.close()
+            arrow_stream = None
+
+        if arrow_stream is not None:
+            with closing(arrow_stream) as r:
+                for batch in pa.ipc.open_stream(_decoded_raw_stream(r)):
+                    yield batch
+        else:
+            with closing(self._stream_data(partitions, compression)) as r:
+                for batch in pa_csv.open_csv(_decoded_raw_stream(r), **self._arrow_csv_options()):
+                    yield batch
+
+    def _stream_data(self, partitions=None, compression="auto", format="tsv-excel-noheader"):
+        return self.client._perform_raw(
+                "GET" , self._url_prefix + "/data/",
                 params = {
-                    "format" : "tsv-excel-noheader",
+                    "format" : format,
                     "partitions" : partitions
-                })
+                },
+                headers={"Accept-Encoding": _stream_accept_encoding(compression)})
+
+    def _arrow_csv_options(self):
+        """Returns the pyarrow.csv options to parse the TSV data of this dataset according to its schema"""
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+
+        arrow_types = {
+            "tinyint": pa.int8(),
+            "smallint": pa.int16(),
+            "int": pa.int32(),
+            "bigint": pa.int64(),
+            "float": pa.float32(),
+            "double": pa.float64(),
+            "boolean": pa.bool_(),
+            "date": pa.timestamp("ms", tz="UTC"),
+        }
+        columns = self.get_schema()["columns"]
+        names = [col["name"] for col in columns]
+        column_types = dict((col["name"], arrow_types.get(col["type"], pa.string())) for col in columns)
+        return {
+            "read_options": pa_csv.ReadOptions(column_names=names, block_size=8 << 20),
+            "parse_options": pa_csv.ParseOptions(delimiter="\t", quote_char='"', double_quote=True, newlines_in_values=True),
+            "convert_options": pa_csv.ConvertOptions(column_types=column_types)
+        }
+
+    def _read_arrow_table(self, partitions=None, compression="auto"):
+        import pyarrow.csv as pa_csv
 
-        return DataikuStreamedHttpUTF8CSVReader(self.get_schema()["columns"], csv_stream).iter_rows()
+        options = self._arrow_csv_options()
+        with closing(self._stream_data(partitions, compression)) as r:
+            # pyarrow reads by blocks of block_size, no need for an additional buffer
+            return pa_csv.read_csv(_decoded_raw_stream(r), **options)
 
 
     def list_partitions(self):
         """
-        Get the list of all partitions of this dataset
+        Get the list of all partitions of this dataset. The list is cached on this handle for a few
+        seconds, until a change is made through it.
+
+        If the settings of this dataset are cached on this handle and have no partitioning dimension,
+        the backend is not called.
         
         Returns:
             the list of partitions, as a list of strings
         """
-        return self.client._perform_json(
-                "GET", "/projects/%s/datasets/%s/partitions" % (self.project_key, self.dataset_name))
+        settings = self._peek_cache("_get_raw_settings")
+        if settings is not None and len(settings.get("partitioning", {}).get("dimensions", [])) == 0:
+            return ["NP"]
+        return self._list_partitions()
+
+    @_cached()
+    def _list_partitions(self):
+        return self.client._perform_http(
+                "GET", self._url_prefix + "/partitions").content
 
 
     def clear(self, partitions=None):
@@ -246,8 +496,9 @@ class DSSDataset(object):
             partitions: (optional) a list of partitions to clear. When not provided, the entire dataset
             is cleared
         """
+        self.invalidate_cache()
         return self.client._perform_json(
-                "DELETE", "/projects/%s/datasets/%s/data" % (self.project_key, self.dataset_name),
+                "DELETE", self._url_prefix + "/data",
                 params={"partitions" : partitions})
 
     def copy_to(self, target, sync_schema=True, write_mode="OVERWRITE"):
@@ -257,15 +508,36 @@ class DSSDataset(object):
         :param target Dataset: a :class:`dataikuapi.dss.dataset.DSSDataset` representing the target of this copy
         :returns: a DSSFuture representing the operation
         """
+        target.invalidate_cache()
         dqr = {
              "targetProjectKey" : target.project_key,
              "targetDatasetName": target.dataset_name,
              "syncSchema": sync_schema,
              "writeMode" : write_mode
         }
-        future_resp = self.client._perform_json("POST", "/projects/%s/datasets/%s/actions/copyTo" % (self.project_key, self.dataset_name), body=dqr)
+        future_resp = self.client._perform_json("POST", self._url_prefix + "/actions/copyTo", body=dqr)
         return DSSFuture(self.client, future_resp.get("jobId", None), future_resp)
 
+    def copy_to_many(self, targets, sync_schema=True, write_mode="OVERWRITE", max_inflight=8):
+        """
+        Copies the data of this dataset to several other datasets, and waits for all the copies to complete.
+
+        Up to max_inflight copies are started and waited for at the same time, instead of one after the other.
+        The DSS job scheduler still governs how many of them actually run concurrently.
+
+        :param list targets: a list of :class:`dataikuapi.dss.dataset.DSSDataset` to copy the data to
+        :param int max_inflight: the maximum number of copies started and not yet completed
+        :returns: the results of the copies, in the same order as targets
+        :rtype: list
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        def copy_and_wait(target):
+            return self.copy_to(target, sync_schema=sync_schema, write_mode=write_mode).wait_for_result()
+
+        with ThreadPoolExecutor(max_workers=max_inflight) as executor:
+            return list(executor.map(copy_and_wait, targets))
+
     ########################################################
     # Dataset actions
     ########################################################
@@ -286,27 +558,58 @@ class DSSDataset(object):
         :return: the :class:`dataikuapi.dss.job.DSSJob` job handle corresponding to the built job
         :rtype: :class:`dataikuapi.dss.job.DSSJob`
         """
+        self.invalidate_cache()
         jd = self.project.new_job(job_type)
         jd.with_output(self.dataset_name, partition=partitions)
         if wait:
-            return jd.start_and_wait()
+            return jd.start_and_wait(no_fail=no_fail)
         else:
             return jd.start()
 
+    @staticmethod
+    def build_many(datasets, job_type="NON_RECURSIVE_FORCED_BUILD", partitions=None, no_fail=False, max_inflight=8):
+        """
+        Starts one job per dataset to build several datasets, and waits for all of them to complete.
+        Raises if one of the jobs failed.
+
+        Up to max_inflight jobs are started and waited for at the same time, instead of one after the other.
+        The DSS job scheduler still governs how many of them actually run concurrently.
+
+        .. code-block:: python
+
+            jobs = DSSDataset.build_many([project.get_dataset(name) for name in ["a", "b", "c"]])
+
+        :param list datasets: a list of :class:`DSSDataset` to build
+        :param job_type: The job type. One of RECURSIVE_BUILD, NON_RECURSIVE_FORCED_BUILD or RECURSIVE_FORCED_BUILD
+        :param partitions: If the datasets are partitioned, a list of partition ids to build
+        :param no_fail: if True, does not raise if a job failed.
+        :param int max_inflight: the maximum number of jobs started and not yet completed
+        :return: the job handles, in the same order as datasets
+        :rtype: list of :class:`dataikuapi.dss.job.DSSJob`
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        def build_and_wait(dataset):
+            return dataset.build(job_type=job_type, partitions=partitions, wait=True, no_fail=no_fail)
+
+        with ThreadPoolExecutor(max_workers=max_inflight) as executor:
+            return list(executor.map(build_and_wait, datasets))
+
 
     def synchronize_hive_metastore(self):
         """
         Synchronize this dataset with the Hive metastore
         """
         self.client._perform_empty(
-                "POST" , "/projects/%s/datasets/%s/actions/synchronizeHiveMetastore" %(self.project_key, self.dataset_name))
+                "POST" , self._url_prefix + "/actions/synchronizeHiveMetastore")
 
     def update_from_hive(self):
         """
         Resynchronize this dataset from its Hive definition
         """
+        self.invalidate_cache()
         self.client._perform_empty(
-                "POST", "/projects/%s/datasets/%s/actions/updateFromHive" %(self.project_key, self.dataset_name))
+                "POST", self._url_prefix + "/actions/updateFromHive")
 
     def compute_metrics(self, partition='', metric_ids=None, probes=None):
         """
@@ -314,7 +617,7 @@ class DSSDataset(object):
         If neither metric ids nor custom probes set are specified, the metrics
         setup on the dataset are used.
         """
-        url = "/projects/%s/datasets/%s/actions" % (self.project_key, self.dataset_name)
+        url = self._url_prefix + "/actions"
         if metric_ids is not None:
             return self.client._perform_json(
                     "POST" , "%s/computeMetricsFromIds" % url,
@@ -335,28 +638,39 @@ class DSSDataset(object):
         """
         if checks is None:
             return self.client._perform_json(
-                    "POST" , "/projects/%s/datasets/%s/actions/runChecks" %(self.project_key, self.dataset_name),
+                    "POST" , self._url_prefix + "/actions/runChecks",
                     params={'partition':partition})
         else:
             return self.client._perform_json(
-                    "POST" , "/projects/%s/datasets/%s/actions/runChecks" %(self.project_key, self.dataset_name),
+                    "POST" , self._url_prefix + "/actions/runChecks",
                     params={'partition':partition}, body=checks)
 
-    def uploaded_add_file(self, fp, filename):
+    def uploaded_add_file(self, fp, filename, chunk_size=DEFAULT_UPLOAD_CHUNK_SIZE):
         """
         Adds a file to an "uploaded files" dataset
 
+        Files larger than 16 MB, or whose size can't be determined, are streamed to DSS by chunks
+        instead of being loaded in memory.
+
         :param file fp: A file-like object that represents the file to upload
         :param str filename: The filename for the file to upload 
+        :param int chunk_size: The size in bytes of the chunks read from fp when streaming
         """
-        self.client._perform_empty("POST", "/projects/%s/datasets/%s/uploaded/files" % (self.project_key, self.dataset_name),
-         files={"file":(filename, fp)})
+        self.invalidate_cache()
+        size = _remaining_file_size(fp)
+        if size is not None and size < MULTIPART_STREAMING_THRESHOLD:
+            self.client._perform_empty("POST", self._url_prefix + "/uploaded/files",
+             files={"file":(filename, fp)})
+        else:
+            body, content_type = _streamed_multipart("file", filename, fp, chunk_size=chunk_size)
+            self.client._perform_empty("POST", self._url_prefix + "/uploaded/files",
+             raw_body=body, headers={"Content-Type": content_type})
 
     def uploaded_list_files(self):
         """
         List the files in an "uploaded files" dataset
         """
-        return self.client._perform_json("GET", "/projects/%s/datasets/%s/uploaded/files" % (self.project_key, self.dataset_name))
+        return self.client._perform_json("GET", self._url_prefix + "/uploaded/files")
 
     ########################################################
     # Lab and ML
@@ -454,12 +768,21 @@ class DSSDataset(object):
         :rtype: list of :class:`dataikuapi.dss.statistics.DSSStatisticsWorksheet`
         """
         worksheets = self.client._perform_json(
-            "GET", "/projects/%s/datasets/%s/statistics/worksheets/" % (self.project_key, self.dataset_name))
+            "GET", self._url_prefix + "/statistics/worksheets/")
         if as_objects:
-            return [self.get_statistics_worksheet(worksheet['id']) for worksheet in worksheets]
+            return [DSSStatisticsWorksheet(self.client, self.project_key, self.dataset_name, worksheet['id'])
+                    for worksheet in worksheets]
         else:
             return worksheets
 
+    def list_statistics_worksheet_ids(self):
+        """
+        List the identifiers of the statistics worksheets associated to this dataset, without creating handles
+
+        :rtype: list of str
+        """
+        return [worksheet['id'] for worksheet in self.list_statistics_worksheets(as_objects=False)]
+
     def create_statistics_worksheet(self, name="My worksheet"):
         """
         Create a new worksheet in the dataset, and return a handle to interact with it.
@@ -484,14 +807,14 @@ class DSSDataset(object):
             }
         }
         created_worksheet = self.client._perform_json(
-            "POST", "/projects/%s/datasets/%s/statistics/worksheets/" % (self.project_key, self.dataset_name),
+            "POST", self._url_prefix + "/statistics/worksheets/",
             body=worksheet_definition
         )
         return self.get_statistics_worksheet(created_worksheet['id'])
 
     def get_statistics_worksheet(self, worksheet_id):
         """
-        Get a handle to interact with a statistics worksheet
+        Get a handle to interact with a statistics worksheet. This does not call the backend.
 
         :param string worksheet_id: the ID of the desired worksheet
 
@@ -511,7 +834,7 @@ class DSSDataset(object):
             a list of metric objects and their value
         """
         return ComputedMetrics(self.client._perform_json(
-                "GET", "/projects/%s/datasets/%s/metrics/last/%s" % (self.project_key, self.dataset_name, 'NP' if len(partition) == 0 else partition)))
+                "GET", "%s/metrics/last/%s" % (self._url_prefix, 'NP' if len(partition) == 0 else partition)))
 
     def get_metric_history(self, metric, partition=''):
         """
@@ -521,8 +844,8 @@ class DSSDataset(object):
             an object containing the values of the metric, cast to the appropriate type (double, boolean,...)
         """
         return self.client._perform_json(
-                "GET", "/projects/%s/datasets/%s/metrics/history/%s" % (self.project_key, self.dataset_name, 'NP' if len(partition) == 0 else partition),
-                params={'metricLookup' : metric if isinstance(metric, str) or isinstance(metric, unicode) else json.dumps(metric)})
+                "GET", "%s/metrics/history/%s" % (self._url_prefix, 'NP' if len(partition) == 0 else partition),
+                params={'metricLookup' : metric if isinstance(metric, basestring) else json.dumps(metric, separators=(',', ':'))})
 
     def get_info(self):
         """
@@ -531,7 +854,7 @@ class DSSDataset(object):
         :returns: a :class:`DSSDatasetInfo` containing all the information about a dataset.
         :rtype: :class:`DSSDatasetInfo`
         """
-        data = self.client._perform_json("GET", "/projects/%s/datasets/%s/info" % (self.project_key, self.dataset_name))
+        data = self.client._perform_json("GET", self._url_prefix + "/info")
         return DSSDatasetInfo(self, data)
 
     ########################################################
@@ -583,7 +906,7 @@ class DSSDataset(object):
         Returns:
             a list of usages
         """
-        return self.client._perform_json("GET", "/projects/%s/datasets/%s/usages" % (self.project_key, self.dataset_name))
+        return self.client._perform_json("GET", self._url_prefix + "/usages")
 
     def get_object_discussions(self):
         """
@@ -598,31 +921,36 @@ class DSSDataset(object):
     # Test / Autofill
     ########################################################
 
-    _FS_TYPES = ["Filesystem", "UploadedFiles", "FilesInFolder",
-                "HDFS", "S3", "Azure", "GCS", "FTP", "SCP", "SFTP"]
+    _FS_TYPES = frozenset(["Filesystem", "UploadedFiles", "FilesInFolder",
+                "HDFS", "S3", "Azure", "GCS", "FTP", "SCP", "SFTP"])
     # HTTP is FSLike but not FS                
 
-    _SQL_TYPES = ["JDBC", "PostgreSQL", "MySQL", "Vertica", "Snowflake", "Redshift",
+    _SQL_TYPES = frozenset(["JDBC", "PostgreSQL", "MySQL", "Vertica", "Snowflake", "Redshift",
                 "Greenplum", "Teradata", "Oracle", "SQLServer", "SAPHANA", "Netezza",
-                "BigQuery", "Athena", "hiveserver2"]
+                "BigQuery", "Athena", "hiveserver2"])
 
-    def test_and_detect(self, infer_storage_types=False):
-        """Used internally by autodetect_settings. It is not usually required to call this method"""
-        settings = self.get_settings()
+    def test_and_detect(self, infer_storage_types=False, settings=None):
+        """
+        Used internally by autodetect_settings. It is not usually required to call this method
+
+        :param settings: (optional) the :class:`DSSDatasetSettings` of this dataset, if already fetched
+        """
+        if settings is None:
+            settings = self.get_settings()
 
         if settings.type in self.__class__._FS_TYPES:
             future_resp = self.client._perform_json("POST",
-                "/projects/%s/datasets/%s/actions/testAndDetectSettings/fsLike"% (self.project_key, self.dataset_name),
+                self._url_prefix + "/actions/testAndDetectSettings/fsLike",
                 body = {"detectPossibleFormats" : True, "inferStorageTypes" : infer_storage_types })
 
             return DSSFuture(self.client, future_resp.get('jobId', None), future_resp)
         elif settings.type in self.__class__._SQL_TYPES:
             return self.client._perform_json("POST",
-                "/projects/%s/datasets/%s/actions/testAndDetectSettings/externalSQL"% (self.project_key, self.dataset_name))
+                self._url_prefix + "/actions/testAndDetectSettings/externalSQL")
         
         elif settings.type == "ElasticSearch":
             return self.client._perform_json("POST",
-                "/projects/%s/datasets/%s/actions/testAndDetectSettings/elasticsearch"% (self.project_key, self.dataset_name))
+                self._url_prefix + "/actions/testAndDetectSettings/elasticsearch")
 
         else:
             raise ValueError("don't know how to test/detect on dataset type:%s" % settings.type)
@@ -635,37 +963,29 @@ class DSSDataset(object):
 
         :rtype: :class:`DSSDatasetSettings` or a subclass
         """
+        self.invalidate_cache()
         settings = self.get_settings()
+        raw = settings.get_raw()
 
         if settings.type in self.__class__._FS_TYPES:
-            future = self.test_and_detect(infer_storage_types)
+            future = self.test_and_detect(infer_storage_types, settings=settings)
             result = future.wait_for_result()
 
-            if not "format" in result or not result["format"]["ok"]:
+            fmt = result.get("format") or {}
+            if not fmt.get("ok"):
                 raise DataikuException("Format detection failed, complete response is " + json.dumps(result))
 
-            settings.get_raw()["formatType"] = result["format"]["type"]
-            settings.get_raw()["formatParams"] = result["format"]["params"]
-            settings.get_raw()["schema"] = result["format"]["schemaDetection"]["newSchema"]
-
+            raw["formatType"], raw["formatParams"], raw["schema"] = fmt["type"], fmt["params"], fmt["schemaDetection"]["newSchema"]
             return settings
 
-        elif settings.type in self.__class__._SQL_TYPES:
-            result = self.test_and_detect()
-
-            if not "schemaDetection" in result:
-                raise DataikuException("Format detection failed, complete response is " + json.dumps(result))
-
-            settings.get_raw()["schema"] = result["schemaDetection"]["newSchema"]
-            return settings
-        
-        elif settings.type == "ElasticSearch":
-            result = self.test_and_detect()
+        elif settings.type in self.__class__._SQL_TYPES or settings.type == "ElasticSearch":
+            result = self.test_and_detect(settings=settings)
 
-            if not "schemaDetection" in result:
+            sd = result.get("schemaDetection")
+            if sd is None:
                 raise DataikuException("Format detection failed, complete response is " + json.dumps(result))
 
-            settings.get_raw()["schema"] = result["schemaDetection"]["newSchema"]
+            raw["schema"] = sd["newSchema"]
             return settings
 
         else:
@@ -740,13 +1060,40 @@ class DSSDatasetSettings(DSSTaggableObjectSettings):
         self.settings["partitioning"] = {"dimensions" : []}
 
     def add_discrete_partitioning_dimension(self, dim_name):
-        self.settings["partitioning"]["dimensions"].append({"name": dim_name, "type": "value"})
+        self.add_discrete_partitioning_dimensions([dim_name])
+
+    def add_discrete_partitioning_dimensions(self, dim_names):
+        """
+        Add several discrete partitioning dimensions at once
+
+        :param list dim_names: the names of the dimensions
+        """
+        self.settings["partitioning"]["dimensions"].extend({"name": dim_name, "type": "value"} for dim_name in dim_names)
 
     def add_time_partitioning_dimension(self, dim_name, period="DAY"):
-        self.settings["partitioning"]["dimensions"].append({"name": dim_name, "type": "time", "params":{"period": period}})
+        self.add_time_partitioning_dimensions([dim_name], period=period)
+
+    def add_time_partitioning_dimensions(self, dim_names, period="DAY"):
+        """
+        Add several time partitioning dimensions at once, all with the same period
+
+        :param list dim_names: the names of the dimensions
+        :param str period: the period of the dimensions, one of YEAR, MONTH, DAY or HOUR
+        """
+        self.settings["partitioning"]["dimensions"].extend({"name": dim_name, "type": "time", "params":{"period": period}}
+                                                           for dim_name in dim_names)
 
     def add_raw_schema_column(self, column):
-        self.settings["schema"]["columns"].append(column)
+        self.add_raw_schema_columns([column])
+
+    def add_raw_schema_columns(self, columns):
+        """
+        Add several columns to the schema at once. When adding many columns, prefer this over
+        repeated calls to :meth:`add_raw_schema_column`, and call :meth:`save` once at the end.
+
+        :param list columns: the columns to add, as dicts with at least a name and a type
+        """
+        self.settings["schema"]["columns"].extend(columns)
 
     @property
     def is_feature_group(self):
@@ -768,8 +1115,9 @@ class DSSDatasetSettings(DSSTaggableObjectSettings):
         self.settings["featureGroup"] = status
 
     def save(self):
+        self.dataset.invalidate_cache()
         self.dataset.client._perform_empty(
-                "PUT", "/projects/%s/datasets/%s" % (self.dataset.project_key, self.dataset.dataset_name),
+                "PUT", self.dataset._url_prefix,
                 body=self.settings)
 
 class FSLikeDatasetSettings(DSSDatasetSettings):
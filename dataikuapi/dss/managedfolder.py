@@ -172,7 +172,7 @@ class DSSManagedFolder(object):
         """
         return self.client._perform_json(
                 "GET", "/projects/%s/managedfolders/%s/metrics/history" % (self.project_key, self.odb_id),
-                params={'metricLookup' : metric if isinstance(metric, str) or isinstance(metric, unicode) else json.dumps(metric)})
+                params={'metricLookup' : metric if isinstance(metric, basestring) else json.dumps(metric, separators=(',', ':'))})
 
 
                 
@@ -3,17 +3,21 @@
 class ComputedMetrics(object):
     def __init__(self, raw):
         self.raw = raw
+        self._metrics_by_id = None
 
     def get_raw(self):
         return self.raw
 
     def get_metric_by_id(self, id):
-        all_ids = []
-        for metric in self.raw["metrics"]:
-            all_ids.append(metric["metric"]["id"])
-            if metric["metric"]["id"] == id:
-                return metric
-        raise Exception("Metric %s not found among: %s" % (id, all_ids))
+        # index the metrics on first lookup, callers typically fetch several metrics from the same values
+        if self._metrics_by_id is None:
+            self._metrics_by_id = {}
+            for metric in self.raw["metrics"]:
+                self._metrics_by_id.setdefault(metric["metric"]["id"], metric)
+        metric = self._metrics_by_id.get(id)
+        if metric is None:
+            raise Exception("Metric %s not found among: %s" % (id, self.get_all_ids()))
+        return metric
 
     def get_global_data(self, metric_id):
         for partition_data in self.get_metric_by_id(metric_id)["lastValues"]:
@@ -212,8 +212,8 @@ class DSSModelEvaluationStore(object):
         """
         return self.client._perform_json(
             "GET", "/projects/%s/modelevaluationstores/%s/metrics/history" % (self.project_key, self.mes_id),
-            params={'metricLookup': metric if isinstance(metric, str)or isinstance(metric, unicode)
-                                           else json.dumps(metric)})
+            params={'metricLookup': metric if isinstance(metric, basestring)
+                                           else json.dumps(metric, separators=(',', ':'))})
 
     def compute_metrics(self, metric_ids=None, probes=None):
         """
@@ -1,25 +1,56 @@
 from .discussion import DSSObjectDiscussions
 from ..utils import DataikuException
+from ..utils import MULTIPART_STREAMING_THRESHOLD, DEFAULT_UPLOAD_CHUNK_SIZE, _remaining_file_size, _streamed_multipart
 import json
 import sys
 import copy
+import mimetypes
 import re
 
-if sys.version_info >= (3,0):
+_PY2 = sys.version_info[0] == 2
+
+if not _PY2:
   import urllib.parse
   dku_quote_fn = urllib.parse.quote
 else:
   import urllib
   dku_quote_fn = urllib.quote
 
+def _native_article_id(article_id):
+    # encode in UTF-8 if its python2 and unicode
+    if _PY2 and isinstance(article_id, unicode):
+        return article_id.encode('utf-8')
+    return article_id
+
+def _taxonomy_article_ids(taxonomy):
+    """
+    Get the flatten list of article IDs from the taxonomy, in depth-first pre-order
+
+    :param list taxonomy: the taxonomy
+    :rtype: list of str
+    """
+    article_ids = []
+    stack = list(reversed(taxonomy))
+    while stack:
+        article = stack.pop()
+        article_ids.append(article["id"])
+        stack.extend(reversed(article["children"]))
+    return article_ids
+
+# characters removed from attachment filenames before uploading them
+_FILENAME_SANITIZE_RE = re.compile(r'[^A-Za-z0-9 ._-]+')
+
 class DSSWiki(object):
     """
     A handle to manage the wiki of a project
     """
+    __slots__ = ("client", "project_key", "_url")
+
     def __init__(self, client, project_key):
         """Do not call directly, use :meth:`dataikuapi.dss.project.DSSProject.get_wiki`"""
         self.client = client
         self.project_key = project_key
+        self._url = "/projects/%s/wiki/" % self.project_key
 
     def get_settings(self):
         """
@@ -28,7 +59,7 @@ class DSSWiki(object):
         :returns: a handle to manage the wiki settings (taxonomy, home article)
         :rtype: :class:`dataikuapi.dss.wiki.DSSWikiSettings`
         """
-        return DSSWikiSettings(self.client, self.project_key, self.client._perform_json("GET", "/projects/%s/wiki/" % (self.project_key)))
+        return DSSWikiSettings(self.client, self.project_key, self.client._perform_json("GET", self._url))
 
     def get_article(self, article_id_or_name):
         """
@@ -42,26 +73,61 @@ class DSSWiki(object):
 
     def __flatten_taxonomy__(self, taxonomy):
         """
-        Private recursive method to get the flatten list of article IDs from the taxonomy
+        Private method to get the flatten list of articles from the taxonomy, in depth-first pre-order
 
         :param list taxonomy:
         :returns: list of articles
         :rtype: list of :class:`dataikuapi.dss.wiki.DSSWikiArticle`
         """
-        article_list = []
-        for article in taxonomy:
-            article_list.append(self.get_article(article['id']))
-            article_list += self.__flatten_taxonomy__(article['children'])
-        return article_list
+        return [self.get_article(article_id) for article_id in _taxonomy_article_ids(taxonomy)]
 
-    def list_articles(self):
+    def list_articles(self, settings=None):
         """
         Get a list of all the articles in form of :class:`dataikuapi.dss.wiki.DSSWikiArticle` objects
 
+        :param settings: (optional) the wiki settings to read the taxonomy from, as returned by :meth:`get_settings`, to
+                         save fetching them again. If not given, they are fetched
+        :type settings: :class:`dataikuapi.dss.wiki.DSSWikiSettings`
         :returns: list of articles
         :rtype: list of :class:`dataikuapi.dss.wiki.DSSWikiArticle`
         """
-        return self.__flatten_taxonomy__(self.get_settings().get_taxonomy())
+        settings = settings or self.get_settings()
+        return self.__flatten_taxonomy__(settings.get_taxonomy())
+
+    def list_articles_with_data(self, settings=None):
+        """
+        Get the data of all the articles, in form of :class:`dataikuapi.dss.wiki.DSSWikiArticleData` objects
+
+        This fetches each article once, whereas calling get_data() on each item of :meth:`list_articles` fetches it twice
+
+        :param settings: (optional) the wiki settings to read the taxonomy from, see :meth:`list_articles`
+        :type settings: :class:`dataikuapi.dss.wiki.DSSWikiSettings`
+        :returns: list of article data handles
+        :rtype: list of :class:`dataikuapi.dss.wiki.DSSWikiArticleData`
+        """
+        settings = settings or self.get_settings()
+        return [self._fetch_article_data(article_id) for article_id in _taxonomy_article_ids(settings.get_taxonomy())]
+
+    def list_articles_parallel(self, max_workers=16, settings=None):
+        """
+        Get the data of all the articles, like :meth:`list_articles_with_data`, but fetching up to max_workers articles at the same time
+
+        :param int max_workers: the maximum number of articles fetched at the same time
+        :param settings: (optional) the wiki settings to read the taxonomy from, see :meth:`list_articles`
+        :type settings: :class:`dataikuapi.dss.wiki.DSSWikiSettings`
+        :returns: list of article data handles, in the same order as :meth:`list_articles`
+        :rtype: list of :class:`dataikuapi.dss.wiki.DSSWikiArticleData`
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        settings = settings or self.get_settings()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self._fetch_article_data, _taxonomy_article_ids(settings.get_taxonomy())))
+
+    def _fetch_article_data(self, article_id):
+        article_id = _native_article_id(article_id)
+        article_data = self.client._perform_json("GET", self._url + dku_quote_fn(article_id))
+        return DSSWikiArticleData(self.client, self.project_key, article_id, article_data)
 
     def create_article(self, article_name, parent_id=None, content=None):
         """
@@ -78,7 +144,7 @@ class DSSWiki(object):
             "name": article_name,
             "parent": parent_id
         }
-        result = self.client._perform_json("POST", "/projects/%s/wiki/" % (self.project_key), body=body)
+        result = self.client._perform_json("POST", self._url, body=body)
         article = DSSWikiArticle(self.client, self.project_key, result['article']['id'])
 
         # set article content if given
@@ -102,7 +168,7 @@ class DSSWiki(object):
             "paperSize": paper_size,
             "exportAttachment": export_attachment
         }
-        return self.client._perform_raw("POST", "/projects/%s/wiki/actions/export" % (self.project_key), body=body)
+        return self.client._perform_raw("POST", self._url + "actions/export", body=body)
 
     def export_to_file(self, path, paper_size="A4", export_attachment=False):
         """
@@ -122,11 +188,15 @@ class DSSWikiSettings(object):
     """
     Global settings for the wiki, including taxonomy. Call save() to save
     """
+    __slots__ = ("client", "project_key", "settings", "_url", "_index")
+
     def __init__(self, client, project_key, settings):
         """Do not call directly, use :meth:`dataikuapi.dss.wiki.DSSWiki.get_settings`"""
         self.client = client
         self.project_key = project_key
         self.settings = settings
+        self._url = "/projects/%s/wiki/" % self.project_key
+        self._index = None
 
     def get_taxonomy(self):
         """
@@ -156,26 +226,57 @@ class DSSWikiSettings(object):
         """
         return self.settings["taxonomy"] if "taxonomy" in self.settings else []
 
-    def __retrieve_article_in_taxonomy__(self, taxonomy, article_id, remove=False):
+    def __index_taxonomy__(self):
         """
-        Private recusive method that get the sub tree structure from the taxonomy for a specific article
+        Private method that indexes the whole taxonomy by article ID
 
-        :param list taxonomy: the current level of taxonomy
-        :param str article_id: the article to retrieve
-        :param bool remove: either remove the sub tree structure or not
-        :returns: the sub tree structure at a specific article level
+        :returns: for each article ID, a tuple of the list of its siblings, its position in that list, its sub tree structure and its parent article ID
         :rtype: dict
         """
-        idx = 0
-        for tax_article in taxonomy:
-            if tax_article["id"] == article_id:
-                ret = taxonomy.pop(idx) if remove else taxonomy[idx]
-                return ret
-            children_ret = self.__retrieve_article_in_taxonomy__(tax_article["children"], article_id, remove)
-            if children_ret is not None:
-                return children_ret
-            idx += 1
-        return None
+        index = {}
+        stack = [(self.settings.get("taxonomy", []), None)]
+        while stack:
+            siblings, parent_id = stack.pop()
+            for idx, tax_article in enumerate(siblings):
+                index[tax_article["id"]] = (siblings, idx, tax_article, parent_id)
+                stack.append((tax_article["children"], tax_article["id"]))
+        return index
+
+    def __is_indexed_entry_current__(self, entry):
+        """
+        Private method that checks that an index entry, and those of its ancestors, still match the taxonomy
+
+        :param tuple entry: the index entry
+        :rtype: bool
+        """
+        siblings, idx, tax_article, parent_id = entry
+        while True:
+            if idx >= len(siblings) or siblings[idx] is not tax_article:
+                return False
+            if parent_id is None:
+                return siblings is self.settings.get("taxonomy")
+            parent_entry = self._index.get(parent_id)
+            if parent_entry is None or parent_entry[2]["children"] is not siblings:
+                return False
+            siblings, idx, tax_article, parent_id = parent_entry
+
+    def __lookup_article_in_taxonomy__(self, article_id):
+        """
+        Private method that get the index entry of an article, indexing the taxonomy again if the article is missing
+        from the index or if its entry no longer matches the taxonomy (which can be modified through get_taxonomy)
+
+        :param str article_id: the article to look up
+        :returns: the list of its siblings, its position in that list, its sub tree structure and its parent article ID, or None if not found
+        :rtype: tuple
+        """
+        if self._index is None:
+            self._index = self.__index_taxonomy__()
+            return self._index.get(article_id)
+        entry = self._index.get(article_id)
+        if entry is None or not self.__is_indexed_entry_current__(entry):
+            self._index = self.__index_taxonomy__()
+            entry = self._index.get(article_id)
+        return entry
 
     def move_article_in_taxonomy(self, article_id, parent_article_id=None):
         """
@@ -184,21 +285,33 @@ class DSSWikiSettings(object):
         :param str article_id: the main article ID
         :param str parent_article_id: the new parent article ID or None for root level
         """
-        old_taxonomy = copy.deepcopy(self.settings["taxonomy"])
-
-        tax_article = self.__retrieve_article_in_taxonomy__(self.settings["taxonomy"], article_id, True)
-        if tax_article is None:
+        entry = self.__lookup_article_in_taxonomy__(article_id)
+        if entry is None:
             raise DataikuException("Article not found: %s" % (article_id))
 
+        # check the new parent before modifying anything: it must exist and not be in the moved sub tree
         if parent_article_id is None:
-            self.settings["taxonomy"].append(tax_article)
+            new_siblings = self.settings["taxonomy"]
         else:
-            tax_parent_article = self.__retrieve_article_in_taxonomy__(self.settings["taxonomy"], parent_article_id, False)
-            if tax_parent_article is None:
-                self.settings["taxonomy"] = old_taxonomy
+            parent_entry = self.__lookup_article_in_taxonomy__(parent_article_id)
+            ancestor_id = parent_article_id
+            while parent_entry is not None and ancestor_id is not None:
+                if ancestor_id == article_id:
+                    parent_entry = None
+                else:
+                    ancestor_id = self._index[ancestor_id][3]
+            if parent_entry is None:
                 raise DataikuException("Parent article not found (or is one of the article descendants): %s" % (parent_article_id))
-            tax_parent_article["children"].append(tax_article)
+            new_siblings = parent_entry[2]["children"]
 
+        siblings, idx, tax_article, parent_id = entry
+        siblings.pop(idx)
+        # the later siblings may have been added through get_taxonomy and not be indexed yet, so their entries
+        # are built from the taxonomy itself rather than updated
+        for shifted_idx in range(idx, len(siblings)):
+            self._index[siblings[shifted_idx]["id"]] = (siblings, shifted_idx, siblings[shifted_idx], parent_id)
+        new_siblings.append(tax_article)
+        self._index[article_id] = (new_siblings, len(new_siblings) - 1, tax_article, parent_article_id)
 
     def set_taxonomy(self, taxonomy):
         """
@@ -207,6 +320,7 @@ class DSSWikiSettings(object):
         :param list taxonomy: the taxonomy
         """
         self.settings["taxonomy"] = taxonomy
+        self._index = None
 
     def get_home_article_id(self):
         """
@@ -229,12 +343,15 @@ class DSSWikiSettings(object):
         """
         Save the current settings to the backend
         """
-        self.settings = self.client._perform_json("PUT", "/projects/%s/wiki/" % (self.project_key), body=self.settings)
+        self.settings = self.client._perform_json("PUT", self._url, body=self.settings)
+        self._index = None
 
 class DSSWikiArticle(object):
     """
     A handle to manage an article
     """
+    __slots__ = ("client", "project_key", "article_id", "_url", "_etag", "_last_data")
+
     def __init__(self, client, project_key, article_id_or_name):
         """Do not call directly, use :meth:`dataikuapi.dss.wiki.DSSWiki.get_article`"""
         self.client = client
@@ -242,10 +359,11 @@ class DSSWikiArticle(object):
 
         # Retrieve the real article id
         article_data = self.client._perform_json("GET", "/projects/%s/wiki/%s" % (project_key, article_id_or_name))
-        self.article_id = article_data["article"]['id']
-        # encode in UTF-8 if its python2 and unicode
-        if sys.version_info < (3,0) and isinstance(self.article_id, unicode):
-            self.article_id = self.article_id.encode('utf-8')
+        self.article_id = _native_article_id(article_data["article"]['id'])
+        self._url = "/projects/%s/wiki/%s" % (self.project_key, dku_quote_fn(self.article_id))
+        # last article data received, and its ETag, to only download the article again when it changed
+        self._etag = None
+        self._last_data = None
 
     def get_data(self):
         """"
@@ -254,20 +372,37 @@ class DSSWikiArticle(object):
         :returns: the article data handle
         :rtype: :class:`dataikuapi.dss.wiki.DSSWikiArticleData`
         """
-        article_data = self.client._perform_json("GET", "/projects/%s/wiki/%s" % (self.project_key, self.article_id))
+        headers = {"If-None-Match": self._etag} if self._etag is not None else None
+        res = self.client._perform_http("GET", self._url, headers=headers)
+        if res.status_code == 304:
+            article_data = copy.deepcopy(self._last_data)
+        else:
+            article_data = res.json()
+            self._etag = res.headers.get("ETag")
+            self._last_data = copy.deepcopy(article_data) if self._etag is not None else None
         return DSSWikiArticleData(self.client, self.project_key, self.article_id, article_data)
 
-    def upload_attachement(self, fp, filename):
+    def upload_attachement(self, fp, filename, chunk_size=DEFAULT_UPLOAD_CHUNK_SIZE):
         """
         Upload an attachment file and attaches it to the article
         Note that the type of file will be determined by the filename extension
 
+        Files larger than 16 MB, or whose size can't be determined, are streamed to DSS by chunks
+        instead of being loaded in memory.
+
         :param file fp: A file-like object that represents the upload file
         :param str filename: The attachement filename
+        :param int chunk_size: The size in bytes of the chunks read from fp when streaming
         """
-        clean_filename = re.sub(r'[^A-Za-z0-9 ._-]+', '', filename)
+        clean_filename = _FILENAME_SANITIZE_RE.sub('', filename)
+        content_type = mimetypes.guess_type(clean_filename)[0] or "application/octet-stream"
 
-        self.client._perform_json("POST", "/projects/%s/wiki/%s/upload" % (self.project_key, dku_quote_fn(self.article_id)), files={"file":(clean_filename, fp)})
+        size = _remaining_file_size(fp)
+        if size is not None and size < MULTIPART_STREAMING_THRESHOLD:
+            self.client._perform_json("POST", self._url + "/upload", files={"file":(clean_filename, fp, content_type)})
+        else:
+            body, multipart_content_type = _streamed_multipart("file", clean_filename, fp, content_type=content_type, chunk_size=chunk_size)
+            self.client._perform_json("POST", self._url + "/upload", raw_body=body, headers={"Content-Type": multipart_content_type})
 
     def get_uploaded_file(self, upload_id):
         """"
@@ -277,7 +412,7 @@ class DSSWikiArticle(object):
         :returns: The requests.Response object
         :rtype: :class:`requests.Response`
         """
-        return self.client._perform_raw("GET", "/projects/%s/wiki/%s/uploads/%s" % (self.project_key, self.article_id, upload_id))
+        return self.client._perform_raw("GET", "%s/uploads/%s" % (self._url, upload_id))
 
     def get_export_stream(self, paper_size="A4", export_children=False, export_attachment=False):
         """
@@ -295,7 +430,7 @@ class DSSWikiArticle(object):
             "exportChildren": export_children,
             "exportAttachment": export_attachment
         }
-        return self.client._perform_raw("POST", "/projects/%s/wiki/%s/actions/export" % (self.project_key, self.article_id), body=body)
+        return self.client._perform_raw("POST", self._url + "/actions/export", body=body)
 
     def export_to_file(self, path, paper_size="A4", export_children=False, export_attachment=False):
         """
@@ -317,7 +452,9 @@ class DSSWikiArticle(object):
         """
         Delete the article
         """
-        self.client._perform_empty("DELETE", "/projects/%s/wiki/%s" % (self.project_key, dku_quote_fn(self.article_id)))
+        self.client._perform_empty("DELETE", self._url)
+        self._etag = None
+        self._last_data = None
 
     def get_object_discussions(self):
         """
@@ -332,12 +469,15 @@ class DSSWikiArticleData(object):
     """
     A handle to manage an article
     """
+    __slots__ = ("client", "project_key", "article_id", "article_data", "_url")
+
     def __init__(self, client, project_key, article_id, article_data):
         """Do not call directly, use :meth:`dataikuapi.dss.wiki.DSSWikiArticle.get_data`"""
         self.client = client
         self.project_key = project_key
         self.article_id = article_id # don't need to check unicode here (already done in DSSWikiArticle)
         self.article_data = article_data
+        self._url = "/projects/%s/wiki/%s" % (self.project_key, dku_quote_fn(self.article_id))
 
     def get_body(self):
         """
@@ -395,4 +535,4 @@ class DSSWikiArticleData(object):
         """
         Save the current article data to the backend.
         """
-        self.article_data = self.client._perform_json("PUT", "/projects/%s/wiki/%s" % (self.project_key, dku_quote_fn(self.article_id)), body=self.article_data)
+        self.article_data = self.client._perform_json("PUT", self._url, body=self.article_data)
@@ -37,6 +37,8 @@ class DSSClient(object):
         self.internal_ticket = internal_ticket
         self.host = host
         self._session = Session()
+        # (project key, webapp id) -> (fetch time, status), see DSSWebApp.get_status
+        self._webapp_status_cache = {}
 
         if self.api_key is not None:
             self._session.auth = HTTPBasicAuth(self.api_key, "")
@@ -1238,19 +1240,22 @@ class DSSClient(object):
                 ex = http_res.json()
             except ValueError:
                 ex = {"message": http_res.text}
-            raise DataikuException("%s: %s" % (ex.get("errorType", "Unknown error"), ex.get("message", "No message")))
+            error = DataikuException("%s: %s" % (ex.get("errorType", "Unknown error"), ex.get("message", "No message")))
+            # lets callers recover from specific failures, e.g. a data format the backend can't serve
+            error.status_code = http_res.status_code
+            raise error
 
-    def _perform_empty(self, method, path, params=None, body=None, files = None, raw_body=None):
-        self._perform_http(method, path, params=params, body=body, files=files, stream=False, raw_body=raw_body)
+    def _perform_empty(self, method, path, params=None, body=None, files = None, raw_body=None, headers=None):
+        self._perform_http(method, path, params=params, body=body, files=files, stream=False, raw_body=raw_body, headers=headers)
 
-    def _perform_text(self, method, path, params=None, body=None,files=None, raw_body=None):
-        return self._perform_http(method, path, params=params, body=body, files=files, stream=False, raw_body=raw_body).text
+    def _perform_text(self, method, path, params=None, body=None,files=None, raw_body=None, headers=None):
+        return self._perform_http(method, path, params=params, body=body, files=files, stream=False, raw_body=raw_body, headers=headers).text
 
-    def _perform_json(self, method, path, params=None, body=None,files=None, raw_body=None):
-        return self._perform_http(method, path,  params=params, body=body, files=files, stream=False, raw_body=raw_body).json()
+    def _perform_json(self, method, path, params=None, body=None,files=None, raw_body=None, headers=None):
+        return self._perform_http(method, path,  params=params, body=body, files=files, stream=False, raw_body=raw_body, headers=headers).json()
 
-    def _perform_raw(self, method, path, params=None, body=None,files=None, raw_body=None):
-        return self._perform_http(method, path, params=params, body=body, files=files, stream=True, raw_body=raw_body)
+    def _perform_raw(self, method, path, params=None, body=None,files=None, raw_body=None, headers=None):
+        return self._perform_http(method, path, params=params, body=body, files=files, stream=True, raw_body=raw_body, headers=headers)
 
     def _perform_json_upload(self, method, path, name, f):
         try:
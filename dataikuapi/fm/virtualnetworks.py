@@ -1,7 +1,13 @@
+import json
 from .future import FMFuture
 
 
+_INTERNET_ACCESS_MODES = frozenset(("YES", "NO", "EGRESS_ONLY"))
+
+
 class FMVirtualNetworkCreator(object):
+    __slots__ = ("client", "data", "use_default_values")
+
     def __init__(self, client, label):
         """
         A builder class to create a Virtual Network
@@ -18,7 +24,7 @@ class FMVirtualNetworkCreator(object):
         """
         :param str internet_access_mode: The internet access mode of the instances created in this virtual network. Accepts "YES", "NO", "EGRESS_ONLY". Defaults to "YES"
         """
-        if internet_access_mode not in ["YES", "NO", "EGRESS_ONLY"]:
+        if internet_access_mode not in _INTERNET_ACCESS_MODES:
             raise ValueError(
                 'internet_access_mode should be either "YES", "NO", or "EGRESS_ONLY"'
             )
@@ -33,8 +39,20 @@ class FMVirtualNetworkCreator(object):
         self.use_default_values = True
         return self
 
+    def _do_create(self, wrapper_cls):
+        """
+        Create the VirtualNetwork and wrap it in the given FMVirtualNetwork subclass
+        """
+        params = {"useDefaultValues": self.use_default_values}
+        vn = self.client._perform_tenant_json(
+            "POST", "/virtual-networks", body=self.data, params=params
+        )
+        return wrapper_cls(self.client, vn)
+
 
 class FMAWSVirtualNetworkCreator(FMVirtualNetworkCreator):
+    __slots__ = ()
+
     def with_vpc(self, aws_vpc_id, aws_subnet_id):
         """
         Setup the VPC and Subnet to with the VirtualNetwork
@@ -60,7 +78,7 @@ class FMAWSVirtualNetworkCreator(FMVirtualNetworkCreator):
         :param str *aws_security_groups: Up to 5 security group ids to assign to the instances created in this virtual network.
         """
         self.data["awsAutoCreateSecurityGroups"] = False
-        self.data["awsSecurityGroups"] = aws_security_groups
+        self.data["awsSecurityGroups"] = list(aws_security_groups)
         return self
 
     def create(self):
@@ -70,13 +88,12 @@ class FMAWSVirtualNetworkCreator(FMVirtualNetworkCreator):
         :return: Created VirtualNetwork
         :rtype: :class:`dataikuapi.fm.virtualnetworks.FMAWSVirtualNetwork`
         """
-        vn = self.client._perform_tenant_json(
-            "POST", "/virtual-networks", body=self.data, params={ 'useDefaultValues':self.use_default_values }
-        )
-        return FMAWSVirtualNetwork(self.client, vn)
+        return self._do_create(FMAWSVirtualNetwork)
 
 
 class FMAzureVirtualNetworkCreator(FMVirtualNetworkCreator):
+    __slots__ = ()
+
     def with_azure_virtual_network(self, azure_vn_id, azure_subnet_id):
         """
         Setup the Azure Virtual Network and Subnet to with the VirtualNetwork
@@ -104,40 +121,50 @@ class FMAzureVirtualNetworkCreator(FMVirtualNetworkCreator):
         :return: Created VirtualNetwork
         :rtype: :class:`dataikuapi.fm.virtualnetworks.FMAzureVirtualNetwork`
         """
-        vn = self.client._perform_tenant_json(
-            "POST", "/virtual-networks", body=self.data, params={ 'useDefaultValues':self.use_default_values }
-        )
-        return FMAzureVirtualNetwork(self.client, vn)
+        return self._do_create(FMAzureVirtualNetwork)
 
 
 class FMVirtualNetwork(object):
+    __slots__ = ("client", "vn_data", "id", "_url", "_delete_future")
+
     def __init__(self, client, vn_data):
         self.client = client
         self.vn_data = vn_data
         self.id = self.vn_data["id"]
+        self._url = "/virtual-networks/%s" % self.id
+        self._delete_future = None
 
     def save(self):
         """
         Update the Virtual Network.
         """
-        self.client._perform_tenant_empty(
-            "PUT", "/virtual-networks/%s" % self.id, body=self.vn_data
-        )
-        self.vn_data = self.client._perform_tenant_json(
-            "GET", "/virtual-networks/%s" % self.id
+        resp = self.client._perform_tenant_text(
+            "PUT", self._url, body=self.vn_data
         )
+        vn_data = json.loads(resp) if resp else None
+        if isinstance(vn_data, dict) and vn_data.get("id") == self.id:
+            self.vn_data = vn_data
+        else:
+            # the updated Virtual Network was not sent back
+            self.vn_data = self.client._perform_tenant_json(
+                "GET", self._url
+            )
 
     def delete(self):
         """
-        Delete the DSS Instance Settings Template.
+        Delete the Virtual Network.
+
+        Calling it again on the same object returns the same future, without deleting again
 
         :return: A :class:`~dataikuapi.fm.future.FMFuture` representing the deletion process
         :rtype: :class:`~dataikuapi.fm.future.FMFuture`
         """
-        future = self.client._perform_tenant_json(
-            "DELETE", "/virtual-networks/%s" % self.id
-        )
-        return FMFuture.from_resp(self.client, future)
+        if self._delete_future is None:
+            future = self.client._perform_tenant_json(
+                "DELETE", self._url
+            )
+            self._delete_future = FMFuture.from_resp(self.client, future)
+        return self._delete_future
 
     def set_fleet_management(
         self, enable, event_server=None, deployer_management="NO_MANAGED_DEPLOYER"
@@ -163,13 +190,15 @@ class FMVirtualNetwork(object):
         """
         Set the HTTPS strategy for this virtual network
 
-        :param object: a :class:`dataikuapi.fm.virtualnetworks.FMHTTPSStrategy`
+        :param dict https_strategy: a strategy built by one of the :class:`dataikuapi.fm.virtualnetworks.FMHTTPSStrategy` factories
         """
         self.vn_data.update(https_strategy)
         return self
 
 
 class FMAWSVirtualNetwork(FMVirtualNetwork):
+    __slots__ = ()
+
     def set_dns_strategy(
         self,
         assign_domain_name,
@@ -195,6 +224,8 @@ class FMAWSVirtualNetwork(FMVirtualNetwork):
 
 
 class FMAzureVirtualNetwork(FMVirtualNetwork):
+    __slots__ = ()
+
     def set_dns_strategy(self, assign_domain_name, azure_dns_zone_id=None):
         """
         Set the DNS strategy for this virtual network
@@ -212,30 +243,23 @@ class FMAzureVirtualNetwork(FMVirtualNetwork):
         return self
 
 
-class FMHTTPSStrategy(dict):
-    def __init__(self, data, https_strategy, http_redirect=False):
-        """
-        A class holding HTTPS Strategy for Virtual Network
+class FMHTTPSStrategy(object):
+    """
+    Factories of HTTPS strategies for Virtual Network, to pass to :meth:`dataikuapi.fm.virtualnetworks.FMVirtualNetwork.set_https_strategy`. Use:
+        - :meth:`dataikuapi.fm.virtualnetwork.FMHTTPSStrategy.disable` to use HTTP only
+        - :meth:`dataikuapi.fm.virtualnetwork.FMHTTPSStrategy.self_signed` to use self-signed certificates
+        - :meth:`dataikuapi.fm.virtualnetwork.FMHTTPSStrategy.custom_cert` to use custom certificates
+        - :meth:`dataikuapi.fm.virtualnetwork.FMHTTPSStrategy.lets_encrypt` to use Let's Encrypt
 
-        Do not create this directly, use:
-            - :meth:`dataikuapi.fm.virtualnetwork.FMHTTPSStrategy.disable` to use HTTP only
-            - :meth:`dataikuapi.fm.virtualnetwork.FMHTTPSStrategy.self_signed` to use self-signed certificates
-            - :meth:`dataikuapi.fm.virtualnetwork.FMHTTPSStrategy.custom_cert` to use custom certificates
-            - :meth:`dataikuapi.fm.virtualnetwork.FMHTTPSStrategy.lets_encrypt` to use Let's Encrypt
-        """
-        super(FMHTTPSStrategy, self).__init__(data)
-        self["httpsStrategy"] = https_strategy
-        if http_redirect:
-            self["httpStrategy"] = "REDIRECT"
-        else:
-            self["httpStrategy"] = "DISABLE"
+    Each factory returns the strategy as a dict
+    """
 
     @staticmethod
     def disable():
         """
         Use HTTP only
         """
-        return FMHTTPSStrategy({}, "NONE", False)
+        return {"httpsStrategy": "NONE", "httpStrategy": "DISABLE"}
 
     @staticmethod
     def self_signed(http_redirect):
@@ -244,7 +268,7 @@ class FMHTTPSStrategy(dict):
 
         :param bool http_redirect: If true, HTTP is redirected to HTTPS. If false, HTTP is disabled. Defaults to false
         """
-        return FMHTTPSStrategy({}, "SELF_SIGNED", http_redirect)
+        return {"httpsStrategy": "SELF_SIGNED", "httpStrategy": "REDIRECT" if http_redirect else "DISABLE"}
 
     @staticmethod
     def custom_cert(http_redirect):
@@ -253,7 +277,7 @@ class FMHTTPSStrategy(dict):
 
         :param bool http_redirect: If true, HTTP is redirected to HTTPS. If false, HTTP is disabled. Defaults to false
         """
-        return FMHTTPSStrategy({}, "CUSTOM_CERTIFICATE", http_redirect)
+        return {"httpsStrategy": "CUSTOM_CERTIFICATE", "httpStrategy": "REDIRECT" if http_redirect else "DISABLE"}
 
     @staticmethod
     def lets_encrypt(contact_mail):
@@ -262,4 +286,4 @@ class FMHTTPSStrategy(dict):
 
         :param str contact_mail: The contact email provided to Let's Encrypt
         """
-        return FMHTTPSStrategy({"contactMail": contact_mail}, "LETSENCRYPT", True)
+        return {"contactMail": contact_mail, "httpsStrategy": "LETSENCRYPT", "httpStrategy": "REDIRECT"}
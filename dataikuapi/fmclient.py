@@ -256,6 +256,19 @@ class FMClient(object):
             raw_body=raw_body,
         )
 
+    def _perform_text(
+        self, method, path, params=None, body=None, files=None, raw_body=None
+    ):
+        return self._perform_http(
+            method,
+            path,
+            params=params,
+            body=body,
+            files=files,
+            stream=False,
+            raw_body=raw_body,
+        ).text
+
     def _perform_json(
         self, method, path, params=None, body=None, files=None, raw_body=None
     ):
@@ -281,6 +294,18 @@ class FMClient(object):
             raw_body=raw_body,
         )
 
+    def _perform_tenant_text(
+        self, method, path, params=None, body=None, files=None, raw_body=None
+    ):
+        return self._perform_text(
+            method,
+            "/tenants/%s%s" % (self.__tenant_id, path),
+            params=params,
+            body=body,
+            files=files,
+            raw_body=raw_body,
+        )
+
     def _perform_tenant_empty(
         self, method, path, params=None, body=None, files=None, raw_body=None
     ):
@@ -1,19 +1,30 @@
-import csv, sys
+import csv, sys, io, gzip
 from dateutil import parser as date_iso_parser
 from contextlib import closing
 import os
 import zipfile
 import itertools
+import binascii
+from urllib3.fields import RequestField
 
 if sys.version_info > (3,0):
     import codecs
+    from urllib.parse import quote as dku_quote_fn
 
     dku_basestring_type = str
     dku_zip_longest = itertools.zip_longest
 else:
+    from urllib import quote as dku_quote_fn
+
     dku_basestring_type = basestring
     dku_zip_longest = itertools.izip_longest
 
+# Size of the read buffer put in front of streamed HTTP responses when parsing rows
+DEFAULT_ROW_STREAM_BUFFER = 262144
+
+# Files larger than this (or of unknown size) are uploaded as a streamed multipart body
+MULTIPART_STREAMING_THRESHOLD = 16 * 1024 * 1024
+DEFAULT_UPLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 class DataikuException(Exception):
@@ -44,15 +55,69 @@ def none_if_throws(f):
     return aux
 
 
+def _stream_accept_encoding(compression):
+    """
+    Returns the Accept-Encoding header value to request a data stream with the given compression mode,
+    "auto" or "none"
+    """
+    if compression == "none" or sys.version_info < (3,0):
+        # the python 2 gzip module can't read from non-seekable streams
+        return "identity"
+    elif compression == "auto":
+        try:
+            import zstandard
+            return "gzip, zstd"
+        except ImportError:
+            return "gzip"
+    else:
+        raise ValueError("Unknown compression: %s" % compression)
+
+def _decoded_raw_stream(response):
+    """Returns a file-like object over the body of a streamed response, decompressed according to its Content-Encoding"""
+    encoding = response.headers.get("Content-Encoding", "").strip().lower()
+    if encoding == "gzip":
+        return gzip.GzipFile(fileobj=response.raw, mode="rb")
+    elif encoding == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().stream_reader(response.raw)
+    else:
+        return response.raw
+
+
+class _RawStream(io.RawIOBase):
+    """
+    Exposes a file-like object as a raw stream that can be wrapped in a :class:`io.BufferedReader`.
+
+    urllib3 closes a response by itself once its body has been fully read, and a BufferedReader
+    reading directly from it would then fail instead of reporting the end of the stream.
+    """
+    def __init__(self, fp):
+        self._fp = fp
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        data = self._fp.read(len(b))
+        n = len(data)
+        b[:n] = data
+        return n
+
+
 class DataikuStreamedHttpUTF8CSVReader(object):
     """
     A CSV reader with a schema
+
+    :param list schema: the columns of the schema
+    :param csv_stream: the streamed :class:`requests.Response` to read the rows from
+    :param int buffer_size: size in bytes of the buffer used to read from the HTTP stream
     """
-    def __init__(self, schema, csv_stream):
+    def __init__(self, schema, csv_stream, buffer_size=DEFAULT_ROW_STREAM_BUFFER):
         self.schema = schema
         self.csv_stream = csv_stream
+        self.buffer_size = buffer_size
 
-    def iter_rows(self):
+    def _casters(self):
         def decode(x):
             if sys.version_info > (3,0):
                 return x
@@ -80,21 +145,56 @@ class DataikuStreamedHttpUTF8CSVReader(object):
             "date": parse_iso_date,
             "boolean": str_to_bool,
         }
-        schema = self.schema
-        casters = [
-            CASTERS.get(col["type"], decode) for col in schema
+        return [
+            CASTERS.get(col["type"], decode) for col in self.schema
         ]
+
+    def _iter_uncasted_tuples(self):
         with closing(self.csv_stream) as r:
+            raw = io.BufferedReader(_RawStream(_decoded_raw_stream(r)), buffer_size=self.buffer_size)
             if sys.version_info > (3,0):
-                raw_generator = codecs.iterdecode(r.raw, 'utf-8')
+                raw_generator = codecs.iterdecode(raw, 'utf-8')
             else:
-                raw_generator = r.raw
+                raw_generator = raw
             for uncasted_tuple in csv.reader(raw_generator,
                                                 delimiter='\t',
                                                 quotechar='"',
                                                 doublequote=True):
-                yield [none_if_throws(caster)(val)
-                        for (caster, val) in dku_zip_longest(casters, uncasted_tuple)]
+                yield uncasted_tuple
+
+    def iter_rows(self):
+        casters = self._casters()
+        for uncasted_tuple in self._iter_uncasted_tuples():
+            yield [none_if_throws(caster)(val)
+                    for (caster, val) in dku_zip_longest(casters, uncasted_tuple)]
+
+    def iter_column_batches(self, batch_size):
+        """
+        Reads the rows by batches, each batch being a list of column value lists in the order of the schema.
+        The values are cast like in :meth:`iter_rows` and appended straight to their column, without
+        building a list per row. Missing trailing values are cast from None, extra ones are dropped.
+
+        :param int batch_size: the maximum number of rows in each batch
+        """
+        casters = [none_if_throws(caster) for caster in self._casters()]
+        width = len(casters)
+        padding = [None] * width
+        columns = [[] for _ in casters]
+        appenders = [column.append for column in columns]
+        count = 0
+        for uncasted_tuple in self._iter_uncasted_tuples():
+            if len(uncasted_tuple) < width:
+                uncasted_tuple = uncasted_tuple + padding[len(uncasted_tuple):]
+            for append, caster, val in zip(appenders, casters, uncasted_tuple):
+                append(caster(val))
+            count += 1
+            if count == batch_size:
+                yield columns
+                columns = [[] for _ in casters]
+                appenders = [column.append for column in columns]
+                count = 0
+        if count > 0:
+            yield columns
 
 class CallableStr(str):
     def __init__(self, val):
@@ -122,3 +222,47 @@ def _write_response_content_to_file(response, path):
             if chunk:
                 f.write(chunk)
                 f.flush()
+
+
+def _remaining_file_size(fp):
+    """Returns the number of bytes left to read in a file-like object, or None if it can't be determined"""
+    try:
+        return os.fstat(fp.fileno()).st_size - fp.tell()
+    except Exception:
+        pass
+    try:
+        position = fp.tell()
+        fp.seek(0, 2)
+        end = fp.tell()
+        fp.seek(position)
+        return end - position
+    except Exception:
+        return None
+
+
+def _streamed_multipart(field_name, filename, fp, content_type="application/octet-stream", chunk_size=DEFAULT_UPLOAD_CHUNK_SIZE):
+    """
+    Builds a multipart/form-data body holding a single file, as a generator of chunks read from fp, so that
+    the file is never fully loaded in memory. Sending a generator makes requests use chunked transfer encoding.
+
+    :returns: a tuple (body generator, value of the Content-Type header)
+    """
+    boundary = binascii.hexlify(os.urandom(16)).decode("ascii")
+    field = RequestField(field_name, None, filename=filename)
+    field.make_multipart(content_type=content_type)
+
+    def generate():
+        part_headers = field.render_headers()
+        if not isinstance(part_headers, bytes):
+            part_headers = part_headers.encode("utf-8")
+        yield ("--%s\r\n" % boundary).encode("ascii") + part_headers
+        while True:
+            chunk = fp.read(chunk_size)
+            if not chunk:
+                break
+            if not isinstance(chunk, bytes):
+                chunk = chunk.encode("utf-8")
+            yield chunk
+        yield ("\r\n--%s--\r\n" % boundary).encode("ascii")
+
+    return generate(), "multipart/form-data; boundary=%s" % boundary
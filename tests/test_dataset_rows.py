@@ -0,0 +1,109 @@
+import gzip
+import io
+import json
+import threading
+import unittest
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+from dataikuapi.dssclient import DSSClient
+from dataikuapi.dss.dataset import DSSDataset
+
+ROW_COUNT = 50000
+SCHEMA = {"columns": [{"name": "id", "type": "bigint"}, {"name": "label", "type": "string"}]}
+TSV_DATA = "".join("%d\tlabel %d\n" % (i, i) for i in range(ROW_COUNT)).encode("utf-8")
+
+
+class _DatasetHandler(BaseHTTPRequestHandler):
+    """Serves the schema and the data of datasets named after the way their data is sent"""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        dataset_name = path.split("/")[6]
+        if path.endswith("/schema"):
+            self._send(json.dumps(SCHEMA).encode("utf-8"), "application/json")
+        elif dataset_name == "chunked":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/tab-separated-values")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for start in range(0, len(TSV_DATA), 65536):
+                chunk = TSV_DATA[start:start + 65536]
+                self.wfile.write(("%x\r\n" % len(chunk)).encode("ascii") + chunk + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        elif dataset_name == "gzip" and "gzip" in self.headers.get("Accept-Encoding", ""):
+            compressed = io.BytesIO()
+            with gzip.GzipFile(fileobj=compressed, mode="wb") as f:
+                f.write(TSV_DATA)
+            self._send(compressed.getvalue(), "text/tab-separated-values", {"Content-Encoding": "gzip"})
+        else:
+            self._send(TSV_DATA, "text/tab-separated-values")
+
+    def _send(self, body, content_type, headers=None):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StreamedRowsTest(unittest.TestCase):
+    """Reads datasets to the end over a real HTTP connection, which urllib3 closes by itself at EOF"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = _ThreadingHTTPServer(("127.0.0.1", 0), _DatasetHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+        cls.client = DSSClient("http://127.0.0.1:%d" % cls.server.server_address[1], api_key="key")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def dataset(self, name):
+        return DSSDataset(self.client, "PROJECT", name)
+
+    def check_rows(self, rows):
+        self.assertEqual(len(rows), ROW_COUNT)
+        self.assertEqual(rows[0], [0, "label 0"])
+        self.assertEqual(rows[-1], [ROW_COUNT - 1, "label %d" % (ROW_COUNT - 1)])
+
+    def test_iter_rows_content_length(self):
+        for compression in ("auto", "none"):
+            self.check_rows(list(self.dataset("plain").iter_rows(compression=compression)))
+
+    def test_iter_rows_chunked(self):
+        for compression in ("auto", "none"):
+            self.check_rows(list(self.dataset("chunked").iter_rows(compression=compression)))
+
+    def test_iter_rows_gzip(self):
+        self.check_rows(list(self.dataset("gzip").iter_rows()))
+
+    def test_iter_rows_batched(self):
+        for name in ("plain", "chunked", "gzip"):
+            batches = list(self.dataset(name).iter_rows_batched(batch_size=7000))
+            self.assertEqual([len(batch["id"]) for batch in batches], [7000] * 7 + [1000])
+            self.assertEqual(batches[-1]["id"][-1], ROW_COUNT - 1)
+            self.assertEqual(batches[0]["label"][0], "label 0")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from dataikuapi.dss.wiki import DSSWikiSettings
+
+
+def _article(article_id, children=None):
+    return {"id": article_id, "children": children or []}
+
+
+class MoveArticleInTaxonomyTest(unittest.TestCase):
+    """Moves articles of a taxonomy that is also modified through get_taxonomy between moves"""
+
+    def settings(self, *articles):
+        return DSSWikiSettings(None, "PROJECT", {"taxonomy": list(articles)})
+
+    def test_move_before_an_appended_sibling(self):
+        settings = self.settings(_article("a"), _article("b"))
+        settings.move_article_in_taxonomy("b")
+        settings.get_taxonomy().append(_article("c"))
+        settings.move_article_in_taxonomy("a")
+        self.assertEqual([article["id"] for article in settings.get_taxonomy()], ["b", "c", "a"])
+
+    def test_move_under_the_child_of_an_appended_sibling(self):
+        settings = self.settings(_article("a"), _article("b"))
+        settings.move_article_in_taxonomy("b")
+        settings.get_taxonomy().append(_article("c", [_article("d")]))
+        settings.move_article_in_taxonomy("a")
+        settings.move_article_in_taxonomy("b", "d")
+        self.assertEqual(settings.get_taxonomy(), [_article("c", [_article("d", [_article("b")])]), _article("a")])
+        settings.move_article_in_taxonomy("c", "a")
+        self.assertEqual(settings.get_taxonomy(), [_article("a", [_article("c", [_article("d", [_article("b")])])])])
+
+
+if __name__ == "__main__":
+    unittest.main()